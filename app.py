@@ -1,17 +1,29 @@
-from fastapi import FastAPI, HTTPException, Query, File, UploadFile, APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Query, File, UploadFile, APIRouter, Request, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse
 from src.speech2text import Speech2Text
-from src.config import CLASS_MODEL, HOST, PORT
+from src.config import (CLASS_MODEL, HOST, PORT, PROFILE_HEADER, PROFILE_TOKEN,
+                        TRANSCRIPT_PAGE_SIZE, TRANSCRIPT_MAX_PAGE_SIZE)
+from src.profiler import RequestProfiler, SORT_KEYS
+from src.transcripts import TranscriptStore
 from src.braille import text_to_braille
 from src.sign import text_to_sign
 from src.fileup import FileHandler
 from typing import Optional
+from datetime import date
 from pydantic import BaseModel
 import base64
+import secrets
+import shutil
+import threading
 import os
 
 app = FastAPI(title="Speech-to-Text API", description="API for converting speech to text using various engines and languages")
-stt = Speech2Text()
+store = TranscriptStore()
+stt = Speech2Text(store=store)
+# stt keeps per-file state (name, wav path), uploads recognized in the threadpool take turns
+stt_lock = threading.Lock()
+profiler = RequestProfiler()
 
 
 class InfoResponse(BaseModel):
@@ -44,10 +56,48 @@ async def read_root():
                 "GET /v1/api/using/sign": "Convert text to Sign Language",
                 "GET /v1/api/using/file/read": "Read and convert file to Braille",
                 "POST /v1/api/using_base64/speech2text_base64": "Convert speech to text (base64 encoded audio)",
+                "GET /v1/api/transcripts": "List past transcripts (filter by audio name and UTC date)",
+                "GET /v1/api/transcripts/search": "Search past transcripts by phrase",
+                "GET /v1/api/admin/profiles": "List stored request profiles (requires X-Profile-Token)",
+                "GET /v1/api/admin/profiles/{profile_id}": "Download a request profile (pstats or text, requires X-Profile-Token)",
             }
         }
     )
 
+def _valid_profile_token(token: Optional[str]) -> bool:
+    # Profiling stays off entirely until STT_PROFILE_TOKEN is configured
+    return bool(PROFILE_TOKEN) and token is not None and secrets.compare_digest(token, PROFILE_TOKEN)
+
+def require_profile_token(request: Request):
+    if not _valid_profile_token(request.headers.get(PROFILE_HEADER)):
+        raise HTTPException(status_code=403, detail="Invalid or missing profile token")
+
+async def profile_request(request: Request, call_next):
+    # Header only, a token in the query string would end up in the access log
+    if (request.url.path.startswith("/v1/api/admin") or not _valid_profile_token(request.headers.get(PROFILE_HEADER))
+            or not profiler.should_profile()):
+        return await call_next(request)
+
+    session = profiler.start()
+    if session is None:
+        return await call_next(request)
+    try:
+        response = await call_next(request)
+    finally:
+        profiler.stop(session)
+    profile_id = await run_in_threadpool(profiler.save, session, request.method, request.url.path)
+    if profile_id:
+        response.headers["X-Profile-Id"] = profile_id
+    return response
+
+# Without a token profiling can never run, so skip the middleware and its per-request overhead entirely
+if PROFILE_TOKEN:
+    app.middleware("http")(profile_request)
+
+def run_stt(file_path: str, audio_name: str):
+    with stt_lock:
+        return stt.start(file_path, audio_name)
+
 using_router = APIRouter(prefix="/v1/api/using", tags=["using"])
 
 @using_router.put("/engine", response_model=InfoResponse)
@@ -68,10 +118,12 @@ async def speech_to_text(file: UploadFile = File(...)):
         os.makedirs(temp_dir, exist_ok=True)
         
         file_path = f"./{temp_dir}/{file.filename}"
+        # Copy in chunks so multi-gigabyte videos never sit in memory as a whole
         with open(file_path, "wb") as buffer:
-            buffer.write(await file.read())        
-        
-        results, _, file_wav = stt.start(file_path)
+            await run_in_threadpool(shutil.copyfileobj, file.file, buffer)
+
+        # Recognition makes one blocking request per chunk, keep it off the event loop
+        results, _, file_wav = await run_in_threadpool(run_stt, file_path, file.filename)
 
         if file.content_type != "audio/wav":
             os.remove(file_path)
@@ -140,7 +192,7 @@ async def speech_to_text_base64(audio: AudioBase64):
         with open(file_path, "wb") as buffer:
             buffer.write(audio_content)
         
-        results, _, file_wav = stt.start(file_path)
+        results, _, file_wav = await run_in_threadpool(run_stt, file_path, audio.filename)
 
         if not file_path.endswith(".wav"):
             os.remove(file_path)
@@ -152,8 +204,70 @@ async def speech_to_text_base64(audio: AudioBase64):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+transcripts_router = APIRouter(prefix="/v1/api/transcripts", tags=["transcripts"])
+
+@transcripts_router.get("", response_model=InfoResponse)
+async def list_transcripts(name: Optional[str] = Query(None, description="Filter by audio name (without extension)"),
+                           date_from: Optional[date] = Query(None, description="First day, UTC (YYYY-MM-DD)"),
+                           date_to: Optional[date] = Query(None, description="Last day, UTC (YYYY-MM-DD)"),
+                           cursor: Optional[int] = Query(None, description="next_cursor of the previous page"),
+                           page_size: int = Query(TRANSCRIPT_PAGE_SIZE, ge=1, le=TRANSCRIPT_MAX_PAGE_SIZE,
+                                                  description="Transcripts per page")):
+    try:
+        results = await run_in_threadpool(store.search, name=name, date_from=date_from, date_to=date_to,
+                                          cursor=cursor, page_size=page_size)
+        return get_info("Transcripts listed successfully.", results)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@transcripts_router.get("/search", response_model=InfoResponse)
+async def search_transcripts(q: str = Query(..., min_length=1, description="Phrase to search for"),
+                             name: Optional[str] = Query(None, description="Filter by audio name (without extension)"),
+                             date_from: Optional[date] = Query(None, description="First day, UTC (YYYY-MM-DD)"),
+                             date_to: Optional[date] = Query(None, description="Last day, UTC (YYYY-MM-DD)"),
+                             cursor: Optional[int] = Query(None, description="next_cursor of the previous page"),
+                             page_size: int = Query(TRANSCRIPT_PAGE_SIZE, ge=1, le=TRANSCRIPT_MAX_PAGE_SIZE,
+                                                    description="Transcripts per page")):
+    try:
+        results = await run_in_threadpool(store.search, phrase=q, name=name, date_from=date_from, date_to=date_to,
+                                          cursor=cursor, page_size=page_size)
+        return get_info(f"Transcripts matching '{q}' found successfully.", results)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+admin_router = APIRouter(prefix="/v1/api/admin", tags=["admin"], dependencies=[Depends(require_profile_token)])
+
+@admin_router.get("/profiles", response_model=InfoResponse)
+async def list_profiles():
+    profiles = await run_in_threadpool(profiler.list_profiles)
+    return get_info("Stored request profiles", {"profiles": profiles})
+
+@admin_router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str,
+                      output_format: str = Query("pstats", alias="format", description="Specify 'pstats' or 'text'"),
+                      sort: str = Query("cumulative", description=f"Sort key for the text report: {', '.join(SORT_KEYS)}")):
+    if output_format not in ("pstats", "text"):
+        raise HTTPException(status_code=400, detail="Unsupported format. Supported formats: pstats, text")
+    try:
+        if output_format == "text":
+            return PlainTextResponse(await run_in_threadpool(profiler.stats_text, profile_id, sort))
+        return FileResponse(profiler.stats_path(profile_id), media_type="application/octet-stream",
+                            filename=f"{profile_id}.prof")
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 app.include_router(using_router)
 app.include_router(base64_router)
+app.include_router(transcripts_router)
+app.include_router(admin_router)
+
+@app.on_event("shutdown")
+def close_store():
+    store.close()
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,4 +1,5 @@
 from typing import Optional, Dict
+from src.profiler import profiled
 
 class BrailleConverter:
     BRAILLE_DICT = {
@@ -15,6 +16,7 @@ class BrailleConverter:
     def __init__(self):
         self.language = "en"
 
+    @profiled("BrailleConverter.convert")
     def convert(self, text: str) -> Dict[str, str]:
         # """Convert text to Braille."""
         if not text:
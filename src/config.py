@@ -6,27 +6,58 @@ CLASS_MODEL: Final[str] = "Speech-to-Text"
 ENGINE: Final[str] = "speech_recognition"
 LANGUAGE: Final[str] = "en-US"
 
+# Audio Configuration
+SAMPLE_RATE: Final[int] = 16000
+VIDEO_FORMATS: Final[list] = [".mp4", ".mkv", ".mov", ".avi", ".webm"]
+CHUNK_SECONDS: Final[int] = 30
+
 # File Paths
 BASE_DIR: Final[str] = os.path.dirname(os.path.abspath(__file__))
 PATH_MP3: Final[str] = os.path.join(BASE_DIR, "temp", "sound")
 PATH_JSON: Final[str] = os.path.join(BASE_DIR, "temp", "json")
+PATH_PROFILES: Final[str] = os.path.join(BASE_DIR, "temp", "profiles")
+PATH_DB: Final[str] = os.path.join(BASE_DIR, "temp", "transcripts.db")
 
 # Server Configuration
 HOST: Final[str] = "localhost"
 PORT: Final[int] = 3000
 BASE_URL: Final[str] = f"http://{HOST}:{PORT}/static/"
 
+# Profiling Configuration
+PROFILE_HEADER: Final[str] = "X-Profile-Token"
+PROFILE_TOKEN: Final[str] = ""
+PROFILE_SAMPLE_RATE: Final[float] = 0.1
+PROFILE_MAX_ARTIFACTS: Final[int] = 50
+
+# Transcript Store Configuration
+TRANSCRIPT_BATCH_SIZE: Final[int] = 100
+TRANSCRIPT_FLUSH_SECONDS: Final[float] = 1.0
+TRANSCRIPT_PAGE_SIZE: Final[int] = 20
+TRANSCRIPT_MAX_PAGE_SIZE: Final[int] = 100
+
 # Ensure directories exist
-for path in [PATH_MP3, PATH_JSON]:
+for path in [PATH_MP3, PATH_JSON, PATH_PROFILES]:
     os.makedirs(path, exist_ok=True)
 
 # Optional: Environment variable overrides
 ENGINE = os.environ.get("STT_ENGINE", ENGINE)
 LANGUAGE = os.environ.get("STT_LANGUAGE", LANGUAGE)
+CHUNK_SECONDS = int(os.environ.get("STT_CHUNK_SECONDS", CHUNK_SECONDS))
 HOST = os.environ.get("STT_HOST", HOST)
 PORT = int(os.environ.get("STT_PORT", PORT))
+PROFILE_TOKEN = os.environ.get("STT_PROFILE_TOKEN", PROFILE_TOKEN)
+PROFILE_SAMPLE_RATE = float(os.environ.get("STT_PROFILE_SAMPLE_RATE", PROFILE_SAMPLE_RATE))
+PROFILE_MAX_ARTIFACTS = int(os.environ.get("STT_PROFILE_MAX_ARTIFACTS", PROFILE_MAX_ARTIFACTS))
+PATH_DB = os.environ.get("STT_PATH_DB", PATH_DB)
+TRANSCRIPT_BATCH_SIZE = int(os.environ.get("STT_TRANSCRIPT_BATCH_SIZE", TRANSCRIPT_BATCH_SIZE))
+TRANSCRIPT_FLUSH_SECONDS = float(os.environ.get("STT_TRANSCRIPT_FLUSH_SECONDS", TRANSCRIPT_FLUSH_SECONDS))
 
 # Validate configuration
 assert ENGINE in ["speech_recognition"], f"Unsupported engine: {ENGINE}"
 assert LANGUAGE, "Language must be specified"
-assert 1 <= PORT <= 65535, f"Invalid port number: {PORT}"
\ No newline at end of file
+assert CHUNK_SECONDS >= 1, f"Invalid chunk length: {CHUNK_SECONDS}"
+assert 1 <= PORT <= 65535, f"Invalid port number: {PORT}"
+assert 0.0 <= PROFILE_SAMPLE_RATE <= 1.0, f"Invalid profile sample rate: {PROFILE_SAMPLE_RATE}"
+assert PROFILE_MAX_ARTIFACTS >= 1, f"Invalid profile artifact limit: {PROFILE_MAX_ARTIFACTS}"
+assert TRANSCRIPT_BATCH_SIZE >= 1, f"Invalid transcript batch size: {TRANSCRIPT_BATCH_SIZE}"
+assert TRANSCRIPT_FLUSH_SECONDS > 0, f"Invalid transcript flush interval: {TRANSCRIPT_FLUSH_SECONDS}"
\ No newline at end of file
@@ -1,6 +1,7 @@
 import os
 from typing import Dict
 from src.braille import text_to_braille
+from src.profiler import profiled
 import PyPDF2
 
 class FileHandler:
@@ -25,6 +26,7 @@ class FileHandler:
         except Exception as e:
             raise Exception(f"Error reading text file: {str(e)}")
 
+    @profiled("FileHandler.process_file")
     def process_file(self, file_content: bytes, filename: str) -> Dict:
         """
         Process file content and convert to braille
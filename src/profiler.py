@@ -0,0 +1,144 @@
+import os
+import io
+import json
+import time
+import uuid
+import random
+import pstats
+import cProfile
+import logging
+import threading
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, List, Optional
+
+try:
+    from src.config import PATH_PROFILES, PROFILE_SAMPLE_RATE, PROFILE_MAX_ARTIFACTS
+except ImportError:
+    from config import PATH_PROFILES, PROFILE_SAMPLE_RATE, PROFILE_MAX_ARTIFACTS
+
+SORT_KEYS = sorted(pstats.Stats.sort_arg_dict_default)
+
+# Profiling session of the current request, None when profiling is off
+_active_session: ContextVar[Optional[Dict]] = ContextVar("active_session", default=None)
+
+
+def profiled(section: str):
+    """
+    Profile the decorated function while the current request is being profiled
+    The outermost profiled call enables cProfile, so other coroutines on the event loop never land in the artifact
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            session = _active_session.get()
+            if session is None:
+                return func(*args, **kwargs)
+            outermost = session["depth"] == 0
+            session["depth"] += 1
+            started = time.perf_counter()
+            if outermost:
+                session["profile"].enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if outermost:
+                    session["profile"].disable()
+                session["depth"] -= 1
+                sections = session["sections"]
+                sections[section] = sections.get(section, 0.0) + time.perf_counter() - started
+        return wrapper
+    return decorator
+
+
+class RequestProfiler:
+    def __init__(self, path_profiles: str = PATH_PROFILES, sample_rate: float = PROFILE_SAMPLE_RATE,
+                 max_artifacts: int = PROFILE_MAX_ARTIFACTS):
+        self.path_profiles = path_profiles
+        self.sample_rate = sample_rate
+        self.max_artifacts = max_artifacts
+        # cProfile can only have one active profiler per interpreter, so requests take turns
+        self._lock = threading.Lock()
+
+    def should_profile(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self) -> Optional[Dict]:
+        """
+        Arm profiling for the current request, profiled sections record into the returned session
+        Returns: profiling session, or None when another request is already being profiled
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        session = {"profile": cProfile.Profile(), "sections": {}, "depth": 0, "started": time.perf_counter()}
+        session["token"] = _active_session.set(session)
+        return session
+
+    def stop(self, session: Dict):
+        """Disarm profiling, must run in the same context as start()"""
+        try:
+            session["elapsed"] = time.perf_counter() - session["started"]
+            _active_session.reset(session["token"])
+        finally:
+            self._lock.release()
+
+    def save(self, session: Dict, method: str, path: str) -> Optional[str]:
+        """
+        Store the pstats artifact with its metadata, blocking file work so run it off the event loop
+        Returns: profile id, or None when the request never entered a profiled section
+        """
+        if not session["sections"]:
+            return None
+        elapsed = session["elapsed"]
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        os.makedirs(self.path_profiles, exist_ok=True)
+        session["profile"].dump_stats(self._stats_path(profile_id))
+        meta = {
+            "id": profile_id,
+            "method": method,
+            "path": path,
+            "created": time.time_ns(),
+            "elapsed": elapsed,
+            # Only time inside profiled sections is in the pstats artifact, elapsed covers the whole request
+            "sections": session["sections"],
+        }
+        with open(self._meta_path(profile_id), "w", encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        logging.info(f"Stored profile {profile_id} for {method} {path} ({elapsed:.3f}s)")
+        self._prune()
+        return profile_id
+
+    def list_profiles(self) -> List[Dict]:
+        """Return stored profile metadata, newest first"""
+        profiles = []
+        for name in os.listdir(self.path_profiles):
+            if name.endswith(".json"):
+                with open(os.path.join(self.path_profiles, name), encoding='utf-8') as f:
+                    profiles.append(json.load(f))
+        return sorted(profiles, key=lambda meta: meta["created"], reverse=True)
+
+    def stats_path(self, profile_id: str) -> str:
+        path = self._stats_path(os.path.basename(profile_id))
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Profile not found: {profile_id}")
+        return path
+
+    def stats_text(self, profile_id: str, sort: str = "cumulative", limit: int = 50) -> str:
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unsupported sort key. Supported keys: {', '.join(SORT_KEYS)}")
+        buffer = io.StringIO()
+        stats = pstats.Stats(self.stats_path(profile_id), stream=buffer)
+        stats.sort_stats(sort).print_stats(limit)
+        return buffer.getvalue()
+
+    def _stats_path(self, profile_id: str) -> str:
+        return os.path.join(self.path_profiles, f"{profile_id}.prof")
+
+    def _meta_path(self, profile_id: str) -> str:
+        return os.path.join(self.path_profiles, f"{profile_id}.json")
+
+    def _prune(self):
+        for meta in self.list_profiles()[self.max_artifacts:]:
+            for path in (self._stats_path(meta["id"]), self._meta_path(meta["id"])):
+                if os.path.exists(path):
+                    os.remove(path)
@@ -71,6 +71,7 @@ import os
 
 from typing import Dict
 from pathlib import Path
+from src.profiler import profiled
 
 class SignLanguage:
     def __init__(self):
@@ -89,6 +90,7 @@ class SignLanguage:
                     sign_dict[char] = str(item)
         return sign_dict
 
+    @profiled("SignLanguage.text_to_sign")
     def text_to_sign(self, text: str) -> dict:
         """Convert text to sign language image references"""
         try:
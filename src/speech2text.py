@@ -153,28 +153,37 @@
 import os
 import json
 import logging
+import subprocess
+import tempfile
 import time
+from contextlib import closing
 from functools import wraps
-from typing import Tuple, Dict, Optional
+from typing import Tuple, Dict, Optional, Iterator
 
 import speech_recognition as sr
 from pydub import AudioSegment
 from requests.exceptions import RequestException
 
 try:
-    from src.config import ENGINE, LANGUAGE, PATH_MP3, PATH_JSON
+    from src.config import ENGINE, LANGUAGE, PATH_MP3, PATH_JSON, SAMPLE_RATE, VIDEO_FORMATS, CHUNK_SECONDS
+    from src.profiler import profiled
+    from src.transcripts import TranscriptStore
 except ImportError:
-    from config import ENGINE, LANGUAGE, PATH_MP3, PATH_JSON
+    from config import ENGINE, LANGUAGE, PATH_MP3, PATH_JSON, SAMPLE_RATE, VIDEO_FORMATS, CHUNK_SECONDS
+    from profiler import profiled
+    from transcripts import TranscriptStore
 
 MULTITASK = False
 if MULTITASK:
     from concurrent.futures import ThreadPoolExecutor
 
 class Speech2Text:
-    def __init__(self, path_mp3: str = PATH_MP3, path_json: str = PATH_JSON):
+    def __init__(self, path_mp3: str = PATH_MP3, path_json: str = PATH_JSON,
+                 store: Optional[TranscriptStore] = None):
         self.recognizer = sr.Recognizer()
         self.path_mp3 = path_mp3
         self.path_json = path_json
+        self.store = store
         self.engine = ENGINE
         self.language = LANGUAGE
         self.name = ""
@@ -198,13 +207,87 @@ class Speech2Text:
             ext_file = os.path.splitext(input_file)[1].lower()
             format_type = ext_file.lstrip('.')  # e.g., 'm4a', 'mp3'
             audio = AudioSegment.from_file(input_file, format=format_type)
-            audio = audio.set_channels(1).set_frame_rate(16000)
+            audio = audio.set_channels(1).set_frame_rate(SAMPLE_RATE)
             audio.export(output_file, format="wav")
             logging.info(f"Converted file: [{input_file}] to WAV [{output_file}]")
         except Exception as e:
             logging.error(f"Error converting file {input_file}: {str(e)}")
             raise
 
+    @staticmethod
+    def is_video(file: str) -> bool:
+        return os.path.splitext(file)[1].lower() in VIDEO_FORMATS
+
+    def stream_audio(self, input_file: str) -> Iterator[sr.AudioData]:
+        """
+        Pipe only the audio stream of a video out of ffmpeg as 16-bit mono PCM
+        Yields: AudioData chunks of CHUNK_SECONDS as soon as ffmpeg produces them
+        """
+        command = [
+            AudioSegment.converter, "-nostdin", "-loglevel", "error", "-i", input_file,
+            "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-",
+        ]
+        chunk_size = SAMPLE_RATE * 2 * CHUNK_SECONDS
+        # stderr goes to a file, a full pipe nobody reads would block ffmpeg and with it our stdout reads
+        with tempfile.TemporaryFile() as errors:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=errors)
+            try:
+                while True:
+                    data = process.stdout.read(chunk_size)
+                    if not data:
+                        break
+                    yield sr.AudioData(data, SAMPLE_RATE, 2)
+                if process.wait() != 0:
+                    errors.seek(0)
+                    raise RuntimeError(errors.read().decode("utf-8", errors="replace").strip())
+                logging.info(f"Extracted audio: [{input_file}]")
+            except Exception as e:
+                logging.error(f"Error extracting audio from {input_file}: {str(e)}")
+                raise
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                process.stdout.close()
+                process.wait()
+
+    def video_to_text(self, file: str) -> Dict:
+        """
+        Recognize a video chunk by chunk while ffmpeg is still extracting
+        Recognition errors are not retried, that would re-run ffmpeg from the start, so the text
+        recognized so far is returned alongside the error instead
+        """
+        transcripts = []
+        error = None
+        try:
+            with closing(self.stream_audio(file)) as chunks:
+                for audio in chunks:
+                    try:
+                        transcripts.append(self.recognizer.recognize_google(audio, language=self.language))
+                    except sr.UnknownValueError:
+                        # Silent or unintelligible chunk, keep going with the rest of the video
+                        continue
+                    except sr.RequestError as e:
+                        logging.error(f"Could not request results from Speech Recognition service; {e}")
+                        error = f"Request failed: {str(e)}"
+                        break
+                    except Exception as e:
+                        logging.error(f"Unexpected error processing file {file}: {str(e)}")
+                        error = f"Unexpected error: {str(e)}"
+                        break
+        except Exception as e:
+            # ffmpeg failed part way, e.g. a truncated container, keep what was recognized before that
+            error = f"Audio extraction failed: {str(e)}"
+
+        if not transcripts:
+            if error:
+                return {"Error": error}
+            logging.warning(f"Speech Recognition could not understand audio: {file}")
+            return {"Error": "Audio not understood"}
+        result = {"audio": file, "text": " ".join(transcripts)}
+        if error:
+            result["Error"] = error
+        return result
+
     def retry_on_exception(max_retries: int = 3, delay: int = 1):
         def decorator(func):
             @wraps(func)
@@ -226,7 +309,9 @@ class Speech2Text:
             return {"Error": "Unsupported engine"}, None
 
         wav_file = f"{self.path_mp3}/{self.name}.wav"
-        if not file.lower().endswith('.wav'):
+        if self.is_video(file):
+            return self.video_to_text(file), None
+        elif not file.lower().endswith('.wav'):
             self.convert_to_wav(file, wav_file)
         else:
             wav_file = file
@@ -260,7 +345,8 @@ class Speech2Text:
             logging.error(f"Error saving JSON for {file_name}: {str(e)}")
             raise
 
-    def start(self, file_name: str) -> Tuple[Dict, Optional[str], Optional[str]]:
+    @profiled("Speech2Text.start")
+    def start(self, file_name: str, audio_name: Optional[str] = None) -> Tuple[Dict, Optional[str], Optional[str]]:
         logging.info("=" * 80)
         logging.info("Single file processing")
         self.ensure_directory(self.path_json)
@@ -270,6 +356,9 @@ class Speech2Text:
         try:
             result, audio_file = self.speech_to_text(file_name)
             # json_file = self.save_json(result, self.name)
+            if self.store and "text" in result and "Error" not in result:
+                # file_name is a temp upload path that the API removes, keep the original upload name instead
+                self.store.add(self.name, audio_name or os.path.basename(file_name), result["text"], self.language)
             logging.info(f"Successfully processed file: {file_name}")
             # return result, json_file, audio_file
             return result, None, audio_file
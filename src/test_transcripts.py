@@ -0,0 +1,97 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.transcripts import TranscriptStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TranscriptStore(str(tmp_path / "transcripts.db"), batch_size=2, flush_seconds=0.05)
+    yield store
+    store.close()
+
+
+def names(results):
+    return [transcript["name"] for transcript in results["transcripts"]]
+
+
+def test_flush_writes_queued_batches(store):
+    for i in range(5):
+        store.add(f"rec_{i}", f"rec_{i}.mp4", f"transcript {i}", "en-US")
+    store.flush()
+    results = store.search()
+    assert names(results) == ["rec_4", "rec_3", "rec_2", "rec_1", "rec_0"]
+    assert results["transcripts"][0]["audio"] == "rec_4.mp4"
+    assert results["next_cursor"] is None
+
+
+def test_close_flushes_pending_transcripts(tmp_path):
+    path = str(tmp_path / "transcripts.db")
+    store = TranscriptStore(path, batch_size=100, flush_seconds=60)
+    store.add("rec", "rec.wav", "hello", "en-US")
+    store.close()
+    assert names(TranscriptStore(path).search()) == ["rec"]
+
+
+def test_phrase_is_quoted(store):
+    store.add("a", "a.wav", "thank you very much", "en-US")
+    store.add("b", "b.wav", "you thank me", "en-US")
+    store.add("c", "c.wav", 'she said "thank you" twice', "en-US")
+    store.flush()
+    assert names(store.search(phrase="thank you")) == ["c", "a"]
+    assert names(store.search(phrase='"thank you"')) == ["c", "a"]
+    # FTS operators in the input are matched as words, not parsed
+    assert names(store.search(phrase="thank OR me")) == []
+    assert names(store.search(phrase="you AND")) == []
+
+
+def test_name_filter_is_exact(store):
+    store.add("rec", "rec.wav", "thank you", "en-US")
+    store.add("rec_1", "rec_1.wav", "thank you", "en-US")
+    store.add("rec_10", "rec_10.wav", "thank you", "en-US")
+    store.flush()
+    assert names(store.search(name="rec_1")) == ["rec_1"]
+    assert names(store.search(phrase="thank you", name="rec")) == ["rec"]
+    assert names(store.search(name="re")) == []
+
+
+def test_date_bounds_are_utc_days(store):
+    store.add("today", "today.wav", "hello", "en-US")
+    store.flush()
+    created = store.search()["transcripts"][0]["created"]
+    assert created.endswith("Z")
+
+    today = datetime.now(timezone.utc).date()
+    assert names(store.search(date_from=today, date_to=today)) == ["today"]
+    assert names(store.search(date_to=today - timedelta(days=1))) == []
+    assert names(store.search(date_from=today + timedelta(days=1))) == []
+
+
+def test_date_bounds_between_days(store):
+    conn = sqlite3.connect(store.path_db)
+    with conn:
+        conn.executemany(
+            "INSERT INTO transcripts (name, audio, text, language, created) VALUES (?, ?, ?, ?, ?)",
+            [(f"day_{day}", f"day_{day}.wav", "hello", "en-US", f"2026-01-0{day}T12:00:00Z") for day in (1, 2, 3)]
+        )
+    conn.close()
+    results = store.search(date_from=datetime(2026, 1, 2).date(), date_to=datetime(2026, 1, 2).date())
+    assert names(results) == ["day_2"]
+    assert names(store.search(phrase="hello", date_from=datetime(2026, 1, 2).date())) == ["day_3", "day_2"]
+
+
+def test_cursor_pages_through_results(store):
+    for i in range(7):
+        store.add(f"rec_{i}", f"rec_{i}.wav", "thank you", "en-US")
+    store.flush()
+    for phrase in (None, "thank you"):
+        seen, cursor = [], None
+        while True:
+            page = store.search(phrase=phrase, cursor=cursor, page_size=3)
+            seen.extend(names(page))
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == [f"rec_{i}" for i in reversed(range(7))]
@@ -0,0 +1,173 @@
+import os
+import time
+import queue
+import sqlite3
+import logging
+import threading
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+try:
+    from src.config import (PATH_DB, TRANSCRIPT_BATCH_SIZE, TRANSCRIPT_FLUSH_SECONDS, TRANSCRIPT_PAGE_SIZE,
+                            TRANSCRIPT_MAX_PAGE_SIZE)
+except ImportError:
+    from config import (PATH_DB, TRANSCRIPT_BATCH_SIZE, TRANSCRIPT_FLUSH_SECONDS, TRANSCRIPT_PAGE_SIZE,
+                        TRANSCRIPT_MAX_PAGE_SIZE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    audio TEXT NOT NULL,
+    text TEXT NOT NULL,
+    language TEXT NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transcripts_name ON transcripts(name);
+CREATE INDEX IF NOT EXISTS idx_transcripts_created ON transcripts(created);
+CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts USING fts5(
+    text, name, content='transcripts', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS transcripts_ai AFTER INSERT ON transcripts BEGIN
+    INSERT INTO transcripts_fts(rowid, text, name) VALUES (new.id, new.text, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS transcripts_ad AFTER DELETE ON transcripts BEGIN
+    INSERT INTO transcripts_fts(transcripts_fts, rowid, text, name) VALUES ('delete', old.id, old.text, old.name);
+END;
+"""
+
+# created is stamped in UTC by SQLite inside the write transaction, so it is taken under the database
+# write lock and grows with id even across several worker processes sharing the database.
+# It is still wall-clock time: a backwards clock step (e.g. an NTP correction) breaks that ordering and
+# date filters, which rely on it, can then silently miss rows written around the step
+INSERT = """
+INSERT INTO transcripts (name, audio, text, language, created)
+VALUES (?, ?, ?, ?, strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))
+"""
+
+COLUMNS = "t.id, t.name, t.audio, t.text, t.language, t.created"
+
+# Pushed through the write queue by flush() and close()
+_FLUSH = object()
+_STOP = object()
+
+
+class TranscriptStore:
+    def __init__(self, path_db: str = PATH_DB, batch_size: int = TRANSCRIPT_BATCH_SIZE,
+                 flush_seconds: float = TRANSCRIPT_FLUSH_SECONDS):
+        self.path_db = path_db
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._local = threading.local()
+        self._queue: queue.Queue = queue.Queue()
+
+        os.makedirs(os.path.dirname(path_db) or ".", exist_ok=True)
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+        self._writer = threading.Thread(target=self._write_loop, name="transcript-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, sqlite3 connections can't be shared across threads"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path_db)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, name: str, audio: str, text: str, language: str):
+        """Queue a transcript, it is written by the background writer in the next batch"""
+        self._queue.put((name, audio, text, language))
+
+    def flush(self):
+        """Block until every queued transcript has been written"""
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait()
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    def _write_loop(self):
+        conn = self._connect()
+        running = True
+        while running:
+            batch, waiters = [], []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_seconds
+            while True:
+                if item is _STOP:
+                    running = False
+                    break
+                if isinstance(item, tuple) and item[0] is _FLUSH:
+                    waiters.append(item[1])
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    with conn:
+                        conn.executemany(INSERT, batch)
+                except Exception as e:
+                    logging.error(f"Error writing {len(batch)} transcripts: {str(e)}")
+            for waiter in waiters:
+                waiter.set()
+        conn.close()
+
+    @staticmethod
+    def _fts_phrase(value: str) -> str:
+        # Quote the input so it is matched as a phrase rather than parsed as FTS syntax
+        return '"' + value.replace('"', '""') + '"'
+
+    def search(self, phrase: Optional[str] = None, name: Optional[str] = None,
+               date_from: Optional[date] = None, date_to: Optional[date] = None,
+               cursor: Optional[int] = None, page_size: int = TRANSCRIPT_PAGE_SIZE) -> Dict:
+        """
+        Look up transcripts newest first, optionally by phrase, exact audio name and UTC date range
+        Returns: dictionary with the page of transcripts and the cursor of the next page
+        """
+        page_size = max(1, min(page_size, TRANSCRIPT_MAX_PAGE_SIZE))
+        clauses, params = [], []
+        if phrase:
+            source = "transcripts_fts f JOIN transcripts t ON t.id = f.rowid"
+            key = "f.rowid"
+            match = f"text : {self._fts_phrase(phrase)}"
+            if name:
+                # Narrow on the name inside the FTS index too, t.name below keeps the match exact
+                match += f" AND name : {self._fts_phrase(name)}"
+            clauses.append("transcripts_fts MATCH ?")
+            params.append(match)
+        else:
+            source = "transcripts t"
+            key = "t.id"
+        if name:
+            clauses.append("t.name = ?")
+            params.append(name)
+        # Ids grow with created (see INSERT), so date bounds become id bounds and paging stays on the rowid
+        if date_from:
+            clauses.append(f"{key} >= (SELECT id FROM transcripts WHERE created >= ? ORDER BY created, id LIMIT 1)")
+            params.append(date_from.isoformat())
+        if date_to:
+            clauses.append(f"{key} <= (SELECT id FROM transcripts WHERE created < ? ORDER BY created DESC, id DESC LIMIT 1)")
+            params.append((date_to + timedelta(days=1)).isoformat())
+        if cursor:
+            clauses.append(f"{key} < ?")
+            params.append(cursor)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT {COLUMNS} FROM {source} {where} ORDER BY {key} DESC LIMIT ?"
+        rows = self._connect().execute(query, params + [page_size + 1]).fetchall()
+
+        results = [dict(row) for row in rows[:page_size]]
+        next_cursor = results[-1]["id"] if len(rows) > page_size else None
+        return {"transcripts": results, "next_cursor": next_cursor}